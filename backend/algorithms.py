@@ -9,9 +9,24 @@ Autores:
     
 """
 
+from bisect import bisect_left, bisect_right
+from operator import sub
+
+from game_logic import LIMITES
 from models import Carton
 
 
+# Victorias consecutivas de un mismo tramo antes de entrar en modo galope
+# (mismo umbral que usa Timsort)
+MIN_GALLOP = 7
+
+# Buffer auxiliar compartido por todas las llamadas a merge_sort. Crece hasta
+# el tamaño del arreglo más grande ordenado y se reutiliza (como el buffer
+# temporal de Timsort). No es seguro entre hilos: merge_sort no debe
+# llamarse en paralelo desde varios hilos.
+_SCRATCH: list[str] = []
+
+
 def merge_sort(arr: list[str]) -> list[str]:
     """
     Ordena un arreglo de strings usando el algoritmo Merge Sort.
@@ -20,11 +35,19 @@ def merge_sort(arr: list[str]) -> list[str]:
       "Introduction to Algorithms", 3rd Edition, MIT Press, 2009.
       Capítulo 2.3: Designing algorithms (páginas 30-37)
 
-    Implementación estándar del algoritmo sin modificaciones significativas respecto a la versión del libro de Cormen.
-
-
-    El algoritmo divide recursivamente el arreglo en mitades hasta tener
-    subarreglos de un solo elemento, luego los combina de forma ordenada.
+    MODIFICACIÓN RESPECTO AL ALGORITMO CLÁSICO:
+    Se usa la variante iterativa "bottom-up" en lugar de la recursiva.
+    En vez de dividir recursivamente el arreglo, se combinan primero
+    subarreglos de tamaño 1, luego de tamaño 2, 4, 8... hasta cubrir todo
+    el arreglo. Se usa un único buffer auxiliar (_SCRATCH, compartido entre
+    llamadas) y en cada pasada se alternan los papeles de origen y destino,
+    evitando la creación de sublistas (arr[:mid], arr[mid:]) y los marcos
+    de recursión. Según la paridad del número de pasadas se elige dónde
+    empezar, de modo que la última pasada escriba siempre en el resultado.
+
+    Complejidad temporal: O(n log n)
+    Complejidad espacial: O(n) para la copia resultado; el buffer auxiliar
+    solo crece si n supera el mayor tamaño ordenado hasta ahora
 
     Args:
         arr: Lista de strings a ordenar
@@ -36,81 +59,190 @@ def merge_sort(arr: list[str]) -> list[str]:
         >>> merge_sort(["casa", "auto", "barco"])
         ['auto', 'barco', 'casa']
     """
+    n = len(arr)
+
     # Caso base: arreglos de 0 o 1 elemento ya están ordenados
-    if len(arr) <= 1:
-        return arr
+    if n <= 1:
+        return arr[:]
+
+    # Asegurar que el buffer compartido tenga al menos n posiciones
+    if len(_SCRATCH) < n:
+        _SCRATCH.extend([""] * (n - len(_SCRATCH)))
+
+    result = arr[:]
+
+    # Número de pasadas: ceil(log2 n). Si es impar se parte del buffer
+    # compartido para que la última pasada escriba en result
+    if (n - 1).bit_length() % 2:
+        _SCRATCH[:n] = arr
+        src, tgt = _SCRATCH, result
+    else:
+        src, tgt = result, _SCRATCH
+
+    # Combinar subarreglos de tamaño width, duplicando el tamaño en cada pasada
+    width = 1
+    while width < n:
+        for start in range(0, n, 2 * width):
+            mid = min(start + width, n)
+            end = min(start + 2 * width, n)
+            _merge(src, tgt, start, mid, end)
+
+        # El destino de esta pasada es el origen de la siguiente
+        src, tgt = tgt, src
+        width *= 2
 
-    # Dividir el arreglo en dos mitades
-    mid = len(arr) // 2
-    left = arr[:mid]
-    right = arr[mid:]
+    return result
 
-    # Ordenar recursivamente cada mitad
-    sorted_left = merge_sort(left)
-    sorted_right = merge_sort(right)
 
-    # Combinar las mitades ordenadas
-    return _merge(sorted_left, sorted_right)
+def _merge(src: list[str], tgt: list[str], start: int, mid: int, end: int) -> None:
+    """
+    Función auxiliar que combina dos tramos ordenados de src en tgt.
 
+    Combina src[start:mid] y src[mid:end] escribiendo el resultado en
+    tgt[start:end] por índice, sin crear listas intermedias.
 
-def _merge(left: list[str], right: list[str]) -> list[str]:
-    """
-    Función auxiliar que combina dos listas ordenadas en una sola lista ordenada.
+    MODIFICACIÓN RESPECTO AL ALGORITMO CLÁSICO (modo galope de Timsort):
+    Peters, T. "listsort.txt", CPython, 2002.
+    Si un mismo tramo gana MIN_GALLOP comparaciones seguidas, se asume que
+    la entrada viene casi ordenada: se localiza con búsqueda binaria
+    (bisect) hasta dónde sigue ganando ese tramo y se copia el bloque
+    completo de una vez, en O(log n) comparaciones en lugar de O(n).
 
     Args:
-        left: Primera lista ordenada
-        right: Segunda lista ordenada
-
-    Returns:
-        Lista combinada y ordenada
+        src: Lista de origen con ambos tramos ordenados
+        tgt: Lista de destino (mismo tamaño que src)
+        start: Inicio del tramo izquierdo
+        mid: Inicio del tramo derecho (fin del izquierdo)
+        end: Fin del tramo derecho
     """
-    result: list[str] = []
-    left_index = 0
-    right_index = 0
-
-    # Comparar elementos de ambas listas y agregar el menor
-    while left_index < len(left) and right_index < len(right):
-        if left[left_index] < right[right_index]:
-            result.append(left[left_index])
+    left_index = start
+    right_index = mid
+    k = start
+    left_wins = 0
+    right_wins = 0
+
+    # Comparar elementos de ambos tramos y escribir el menor
+    while left_index < mid and right_index < end:
+        if src[left_index] <= src[right_index]:
+            tgt[k] = src[left_index]
             left_index += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+
+            if left_wins >= MIN_GALLOP and left_index < mid:
+                # Galope: copiar todos los del tramo izquierdo <= cabeza derecha
+                stop = bisect_right(src, src[right_index], left_index, mid)
+                tgt[k : k + stop - left_index] = src[left_index:stop]
+                k += stop - left_index
+                left_index = stop
+                left_wins = 0
         else:
-            result.append(right[right_index])
+            tgt[k] = src[right_index]
             right_index += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
 
-    # Agregar elementos restantes de ambas listas
-    result.extend(left[left_index:])
-    result.extend(right[right_index:])
+            if right_wins >= MIN_GALLOP and right_index < end:
+                # Galope: copiar todos los del tramo derecho < cabeza izquierda
+                stop = bisect_left(src, src[left_index], right_index, end)
+                tgt[k : k + stop - right_index] = src[right_index:stop]
+                k += stop - right_index
+                right_index = stop
+                right_wins = 0
 
-    return result
+    # Copiar elementos restantes (solo uno de los tramos tiene sobrantes)
+    if left_index < mid:
+        tgt[k:end] = src[left_index:mid]
+    else:
+        tgt[k:end] = src[right_index:end]
 
 
 def binary_search_mark(carton: dict, palabra: str) -> bool:
     """
-    Busca una palabra en un cartón usando Búsqueda Binaria y la marca si existe.
-
-     - Binary Search: Knuth, D. E. "The Art of Computer Programming",
-      Volume 3: Sorting and Searching, 2nd Edition, Addison-Wesley, 1998.
-      Sección 6.2.1: Searching an ordered table
+    Busca una palabra en un cartón y la marca si existe.
 
-    MODIFICACIÓN RESPECTO AL ALGORITMO CLÁSICO:
-    Además de buscar, esta función modifica el estado del cartón:
-    - Marca la palabra como encontrada (marcadas[mid] = True)
-    - Incrementa el contador de aciertos (total_aciertos += 1)
+    Usa el diccionario carton["indices"] (palabra -> posición), construido
+    una sola vez al procesar el cartón, en lugar de Búsqueda Binaria:
+    una consulta hash O(1) es más barata que las ~log2(24) = 5 iteraciones
+    del ciclo en Python. La versión con Búsqueda Binaria se conserva en
+    binary_search_mark_classic.
 
     Args:
-        carton: Diccionario con la estructura del cartón (palabras ordenadas)
+        carton: Diccionario con la estructura del cartón
         palabra: Palabra a buscar
 
     Returns:
         True si la palabra fue encontrada, False en caso contrario
+    """
+    i = carton["indices"].get(palabra)
+    if i is None:
+        return False
+
+    # Marcar el bit i de la máscara (idempotente si ya estaba marcado)
+    carton["marcadas"] |= 1 << i
+    return True
+
+
+def mark_word_columns(
+    palabra: str,
+    hit: list[int],
+    indices: list[dict[str, int]],
+    marcadas: list[int],
+    limites: list[int],
+    ya_gano: list[bool],
+) -> tuple[list[int], list[int], bool]:
+    """
+    Marca una palabra en los cartones de una partida (ver GameState).
 
-    Precondición:
-        Las palabras en carton["palabras"] deben estar ordenadas alfabéticamente
-        (esto se garantiza al procesar los cartones con merge_sort)
+    Misma búsqueda que binary_search_mark (índice palabra -> posición de
+    cada cartón), aplicada sobre las columnas de la partida y solo a los
+    cartones hit que el índice invertido indica que contienen la palabra.
+
+    Args:
+        palabra: Palabra cantada
+        hit: Posiciones de los cartones que contienen la palabra
+        indices: Columna palabra -> posición de cada cartón
+        marcadas: Columna de máscaras de bits (se modifica en el lugar)
+        limites: Columna con el total de palabras de cada cartón
+        ya_gano: Columna que indica si el cartón ya ganó (se omiten)
+
+    Returns:
+        Tupla (posiciones marcadas ahora, posiciones que completaron su
+        cartón, True si algún cartón sin ganar contiene la palabra)
     """
-    palabras = carton["palabras"]
-    marcadas = carton["marcadas"]
+    updated: list[int] = []
+    completed: list[int] = []
+    found_in_any = False
+
+    for i in hit:
+        # Solo procesar cartones que no hayan ganado
+        if ya_gano[i]:
+            continue
+
+        found_in_any = True
+        bit = 1 << indices[i][palabra]
+        if marcadas[i] & bit:
+            continue
+
+        marcadas[i] |= bit
+        updated.append(i)
+
+        # Cartón completo: todos los bits de la máscara encendidos
+        if marcadas[i] == (1 << limites[i]) - 1:
+            completed.append(i)
 
+    return updated, completed, found_in_any
+
+
+def _binary_search(palabras: list[str], palabra: str) -> int:
+    """
+    Búsqueda Binaria clásica (ciclo while) sobre una lista ordenada.
+
+    Returns:
+        Posición de la palabra, o -1 si no existe
+    """
     left = 0
     right = len(palabras) - 1
 
@@ -119,11 +251,7 @@ def binary_search_mark(carton: dict, palabra: str) -> bool:
         mid_value = palabras[mid]
 
         if mid_value == palabra:
-            # Palabra encontrada - MODIFICACIÓN: marcar y actualizar contador
-            if not marcadas[mid]:
-                marcadas[mid] = True
-                carton["total_aciertos"] += 1
-            return True
+            return mid
 
         if mid_value < palabra:
             # Buscar en la mitad derecha
@@ -133,42 +261,169 @@ def binary_search_mark(carton: dict, palabra: str) -> bool:
             right = mid - 1
 
     # Palabra no encontrada
-    return False
+    return -1
+
+
+def _build_unrolled_search(n: int):
+    """
+    Genera una Búsqueda Binaria desenrollada para listas de exactamente n
+    elementos (evaluación parcial del ciclo de _binary_search).
+
+    Como n es conocido, todos los valores de mid se calculan aquí y el
+    código generado es un árbol de if/else sin ciclo ni aritmética:
+
+        def _search_3(palabras, palabra):
+            if palabra == palabras[1]:
+                return 1
+            if palabra < palabras[1]:
+                if palabra == palabras[0]:
+                    return 0
+                return -1
+            if palabra == palabras[2]:
+                return 2
+            return -1
+
+    Returns:
+        Función (palabras, palabra) -> posición o -1
+    """
+    lines = [f"def _search_{n}(palabras, palabra):"]
+
+    def emit(left: int, right: int, depth: int) -> None:
+        indent = "    " * depth
+        if left > right:
+            lines.append(f"{indent}return -1")
+            return
+
+        mid = (left + right) // 2
+        lines.append(f"{indent}if palabra == palabras[{mid}]:")
+        lines.append(f"{indent}    return {mid}")
+        if left <= mid - 1:
+            lines.append(f"{indent}if palabra < palabras[{mid}]:")
+            emit(left, mid - 1, depth + 1)
+        emit(mid + 1, right, depth)
+
+    emit(0, n - 1, 1)
+
+    namespace: dict = {}
+    exec("\n".join(lines), namespace)
+    return namespace[f"_search_{n}"]
+
+
+# Tamaño máximo de cartón (el mayor límite de palabras por idioma)
+MAX_UNROLLED_SIZE = max(LIMITES.values())
+
+# Búsquedas desenrolladas por cantidad de palabras, generadas al importar
+_SEARCH_BY_SIZE = {
+    n: _build_unrolled_search(n) for n in range(1, MAX_UNROLLED_SIZE + 1)
+}
+
+
+def binary_search_mark_classic(carton: dict, palabra: str) -> bool:
+    """
+    Busca una palabra en un cartón usando Búsqueda Binaria y la marca si existe.
+
+     - Binary Search: Knuth, D. E. "The Art of Computer Programming",
+      Volume 3: Sorting and Searching, 2nd Edition, Addison-Wesley, 1998.
+      Sección 6.2.1: Searching an ordered table
+
+    MODIFICACIÓN RESPECTO AL ALGORITMO CLÁSICO:
+    Además de buscar, esta función modifica el estado del cartón:
+    - Marca la palabra como encontrada (bit mid de la máscara marcadas)
+
+    Para los tamaños de cartón posibles (1 a MAX_UNROLLED_SIZE palabras) la
+    búsqueda usa un árbol de comparaciones desenrollado (ver
+    _build_unrolled_search); para otros tamaños, el ciclo clásico.
+
+    Versión académica: la API marca las palabras con mark_word_columns.
+
+    Args:
+        carton: Diccionario con la estructura del cartón (palabras ordenadas)
+        palabra: Palabra a buscar
+
+    Returns:
+        True si la palabra fue encontrada, False en caso contrario
+
+    Precondición:
+        Las palabras en carton["palabras"] deben estar ordenadas alfabéticamente
+        (esto se garantiza al procesar los cartones en process_input_data)
+    """
+    palabras = carton["palabras"]
+
+    # Versión desenrollada para el tamaño del cartón (o el ciclo genérico)
+    search = _SEARCH_BY_SIZE.get(len(palabras), _binary_search)
+    mid = search(palabras, palabra)
+
+    if mid < 0:
+        # Palabra no encontrada
+        return False
+
+    # Palabra encontrada - MODIFICACIÓN: marcar el bit correspondiente
+    carton["marcadas"] |= 1 << mid
+    return True
+
+
+def check_winners_greedy(limites: list[int], marcadas: list[int]) -> list[int]:
+    """
+    Detecta cartones ganadores con una sola pasada sobre las columnas.
+
+    Un cartón gana cuando todos los bits de su máscara están encendidos
+    (marcadas == 2**limite - 1), así que basta un filtro O(n): ordenar
+    por palabras faltantes (O(n log n)) no es necesario para encontrarlos.
+    La versión Greedy con ordenamiento y early-break se conserva en
+    check_winners_greedy_sorted.
+
+    Args:
+        limites: Total de palabras de cada cartón
+        marcadas: Máscara de palabras marcadas de cada cartón (misma posición)
+
+    Returns:
+        Posiciones de los cartones ganadores (todas sus palabras marcadas)
+    """
+    return [
+        i
+        for i, (limite, mascara) in enumerate(zip(limites, marcadas))
+        if mascara == (1 << limite) - 1
+    ]
 
 
-def check_winners_greedy(cartones: list[dict]) -> list[dict]:
+def check_winners_greedy_sorted(limites: list[int], marcadas: list[int]) -> list[int]:
     """
     Detecta cartones ganadores usando una estrategia Greedy (voraz).
 
       - Greedy Algorithm: Diseño propio basado en estrategia voraz.
       Referencia conceptual: Cormen et al., Capítulo 16: Greedy Algorithms
 
+    Recorre el estado en columnas (Structure of Arrays, ver GameState):
+    solo se leen las dos columnas de enteros necesarias en lugar de un
+    diccionario completo por cartón.
 
     Args:
-        cartones: Lista de diccionarios representando cartones
+        limites: Total de palabras de cada cartón
+        marcadas: Máscara de palabras marcadas de cada cartón (misma posición)
 
     Returns:
-        Lista de cartones ganadores (aquellos con todas las palabras marcadas)
+        Posiciones de los cartones ganadores (todas sus palabras marcadas)
     """
-    # Crear copia para no modificar la lista original durante el ordenamiento
-    candidates = cartones.copy()
+    # Distancia a ganar (cantidad de palabras faltantes) de cada cartón,
+    # calculada columna contra columna con map (ciclo en C); los aciertos
+    # son los bits encendidos de la máscara
+    faltantes = list(map(sub, limites, map(int.bit_count, marcadas)))
 
-    # Ordenar por distancia a ganar (cantidad de palabras faltantes)
     # Estrategia greedy: procesar primero los más cercanos a completarse
-    candidates.sort(
-        key=lambda c: c["limite_palabras"] - c["total_aciertos"]
-    )
+    # (se ordenan posiciones, no cartones)
+    order = sorted(range(len(faltantes)), key=faltantes.__getitem__)
 
-    winners: list[dict] = []
+    winners: list[int] = []
 
-    for carton in candidates:
+    for i in order:
         # Verificar si el cartón completó todas sus palabras
-        if carton["total_aciertos"] == carton["limite_palabras"]:
-            winners.append(carton)
+        if faltantes[i] == 0:
+            winners.append(i)
         else:
             # OPTIMIZACIÓN EARLY-BREAK:
-            # Como la lista está ordenada por palabras faltantes (ascendente),
-            # si encontramos uno que no ganó, los siguientes tampoco ganaron
+            # Como las posiciones están ordenadas por palabras faltantes
+            # (ascendente), si encontramos uno que no ganó, los siguientes
+            # tampoco ganaron
             break
 
     return winners
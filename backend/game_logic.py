@@ -14,20 +14,23 @@ Referencias:
       Jugador -> Cartones del formato de entrada.
 
 Modificaciones realizadas:
-    - generate_random_rounds (líneas 163-185): Implementación estándar del
-      algoritmo Fisher-Yates sin modificaciones respecto a la versión clásica.
+    - fisher_yates_shuffle_manual: Implementación estándar del algoritmo
+      Fisher-Yates sin modificaciones respecto a la versión clásica.
+      generate_random_rounds usa random.shuffle (mismo algoritmo, en C).
 
-    - process_input_data (líneas 40-160): Implementación original que combina:
+    - process_input_data: Implementación original que combina:
       * Parsing línea por línea con detección de contexto (jugador actual)
       * Validación de formato de ID (prefijo idioma + 6 dígitos)
       * Validación contra bancos de palabras
-      * Integración con merge_sort para ordenar palabras de cada cartón
+      * Ordenamiento de palabras de cada cartón con list.sort (Timsort de
+        CPython). merge_sort se conserva en algorithms.py como
+        implementación académica del mismo criterio de orden.
 """
 
 import random
-import re
+import sys
+from collections import Counter
 from models import Carton, Idioma
-from algorithms import merge_sort
 
 
 # Límites máximos de palabras por idioma
@@ -40,7 +43,7 @@ LIMITES: dict[Idioma, int] = {
 
 
 def process_input_data(
-    text: str, word_banks: dict[str, set[str]], existing_ids: set[str] | None = None
+    text: str, word_banks: dict[str, frozenset[str]], existing_ids: set[str] | None = None
 ) -> tuple[list[Carton], list[str]]:
     """
     Procesa texto de entrada y extrae cartones de bingo validados.
@@ -102,8 +105,8 @@ def process_input_data(
             )
             continue
 
-        # Parsear partes de la línea
-        parts = line.split()
+        # Parsear partes de la línea (internadas, como las del banco)
+        parts = [sys.intern(p) for p in line.split()]
         if len(parts) < 2:
             continue
 
@@ -117,9 +120,13 @@ def process_input_data(
             )
             continue
 
-        # Validar parte numérica del ID (exactamente 6 dígitos)
+        # Validar parte numérica del ID (exactamente 6 dígitos ASCII)
         numeric_part = card_id[2:]
-        if len(numeric_part) != 6 or not re.match(r"^\d{6}$", numeric_part):
+        if (
+            len(numeric_part) != 6
+            or not numeric_part.isascii()
+            or not numeric_part.isdigit()
+        ):
             errores.append(
                 f"Línea {line_number}: ID '{card_id}' inválido. "
                 f"Debe tener exactamente 6 dígitos numéricos después del "
@@ -146,15 +153,10 @@ def process_input_data(
         idioma: Idioma = language_code  # type: ignore
         raw_words = parts[1:]
         # Verificar que no haya palabras repetidas en el mismo cartón
-        seen_words: set[str] = set()
-        duplicate_words: set[str] = set()
-        for w in raw_words:
-            if w in seen_words:
-                duplicate_words.add(w)
-            else:
-                seen_words.add(w)
-
-        if duplicate_words:
+        # (el set se construye en C; solo se cuentan repeticiones si las hay)
+        seen_words = set(raw_words)
+        if len(seen_words) != len(raw_words):
+            duplicate_words = [w for w, n in Counter(raw_words).items() if n > 1]
             errores.append(
                 f"Línea {line_number} ({card_id}): Palabras repetidas en el cartón: [{', '.join(sorted(duplicate_words))}]"
             )
@@ -177,28 +179,34 @@ def process_input_data(
             )
             continue
 
-        # Validar que todas las palabras existan en el banco
-        invalid_words = [w for w in raw_words if w not in word_bank]
-        if invalid_words:
+        # Validar que todas las palabras existan en el banco (diferencia de sets)
+        invalid_set = seen_words - word_bank
+        if invalid_set:
+            # Reportar en el orden en que aparecen en la línea
+            invalid_words = [w for w in raw_words if w in invalid_set]
             errores.append(
                 f"Línea {line_number} ({card_id}): Palabras no permitidas "
                 f"[{', '.join(invalid_words)}]"
             )
             continue
 
-        # Ordenar palabras usando Merge Sort (algoritmo implementado)
-        sorted_words = merge_sort(raw_words)
+        # Ordenar palabras con Timsort (list.sort, implementado en C): mismo
+        # resultado que merge_sort pero sin recursión ni slicing en Python.
+        # raw_words ya es una copia (parts[1:]), se ordena en su lugar
+        raw_words.sort()
+        sorted_words = raw_words
 
         ids_in_current_load.add(card_id)
 
-        # Crear cartón válido
-        carton = Carton(
+        # Crear cartón válido (los datos ya fueron validados arriba, así que
+        # se construye sin repetir la validación de Pydantic)
+        carton = Carton.model_construct(
             id=card_id,
             jugador=current_player,
             idioma=idioma,
             palabras=sorted_words,
-            marcadas=[False] * len(sorted_words),
-            total_aciertos=0,
+            marcadas=0,
+            indices=dict(zip(sorted_words, range(len(sorted_words)))),
             limite_palabras=len(sorted_words),
             ya_gano=False,
         )
@@ -211,6 +219,26 @@ def generate_random_rounds(available_languages: list[Idioma]) -> list[Idioma]:
     """
     Genera un orden aleatorio para las rondas del juego usando Fisher-Yates Shuffle.
 
+    Usa random.shuffle, que implementa el mismo algoritmo Fisher-Yates
+    con el ciclo de intercambios en C. La versión paso a paso en Python
+    se conserva en fisher_yates_shuffle_manual.
+
+    Args:
+        available_languages: Lista de idiomas disponibles para las rondas
+
+    Returns:
+        Lista de idiomas en orden aleatorio
+    """
+    # Crear copia para no modificar la lista original
+    languages = available_languages.copy()
+    random.shuffle(languages)
+    return languages
+
+
+def fisher_yates_shuffle_manual(available_languages: list[Idioma]) -> list[Idioma]:
+    """
+    Genera un orden aleatorio para las rondas del juego usando Fisher-Yates Shuffle.
+
     El algoritmo Fisher-Yates (también conocido como Knuth Shuffle) garantiza
     que todas las permutaciones posibles tienen igual probabilidad de ocurrir.
 
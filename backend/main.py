@@ -12,24 +12,33 @@ Referencias:
 
 Descripción:
     Servidor API REST que expone los algoritmos del juego de Bingo.
-    Los algoritmos principales (Merge Sort, Binary Search, Greedy) se
-    encuentran implementados en algorithms.py con sus respectivas
-    referencias académicas.
+    El marcado de palabras usa mark_word_columns (algorithms.py) sobre el
+    estado por columnas de la partida. Merge Sort, Binary Search y Greedy
+    se conservan en algorithms.py como implementaciones académicas con sus
+    respectivas referencias; en ejecución se usan list.sort, índices hash
+    y la cola de ganadores pendientes.
 
 Ejecución:
     uvicorn main:app --reload --port 8000
 """
 
+import ast
 import os
+import re
+import sys
+import uuid
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from models import (
     ProcessCardsRequest,
     ProcessCardsResponse,
+    RestoreGameRequest,
+    RestoreGameResponse,
     CallWordRequest,
     CallWordResponse,
     CheckWinnersRequest,
@@ -39,22 +48,110 @@ from models import (
     ValidateWordRequest,
     ValidateWordResponse,
     Carton,
+    GameState,
 )
-from algorithms import binary_search_mark, check_winners_greedy
 from game_logic import process_input_data, generate_random_rounds, LIMITES
+from algorithms import mark_word_columns
 
 
 # Almacenamiento de bancos de palabras (cargados al iniciar)
-word_banks: dict[str, set[str]] = {}
+word_banks: dict[str, frozenset[str]] = {}
 
+# Respuesta JSON de /api/word-banks, serializada una sola vez al iniciar
+word_banks_json: bytes = b""
 
-def load_word_banks() -> dict[str, set[str]]:
+# Partidas en curso: game_id -> estado de la partida. El dict conserva el
+# orden de uso (la más reciente al final) para descartar la menos usada (LRU)
+games: dict[str, GameState] = {}
+
+# Máximo de partidas en memoria antes de descartar la menos usada
+MAX_GAMES = int(os.getenv("MAX_GAMES", "100"))
+
+
+def create_game() -> tuple[str, GameState]:
+    """Crea una partida vacía, descartando la menos usada si se llegó a MAX_GAMES."""
+    while len(games) >= MAX_GAMES:
+        del games[next(iter(games))]
+
+    game_id = uuid.uuid4().hex
+    game = games[game_id] = GameState()
+    return game_id, game
+
+
+def get_game(game_id: str) -> GameState:
+    """
+    Retorna el estado de una partida o responde 404 si no existe (o fue
+    descartada). La partida pasa a ser la más recientemente usada.
+    """
+    game = games.pop(game_id, None)
+    if game is None:
+        raise HTTPException(status_code=404, detail=f"Partida '{game_id}' no encontrada")
+    games[game_id] = game
+    return game
+
+
+def add_cartones(game: GameState, cartones: list[Carton]) -> None:
+    """Agrega cartones a las columnas de la partida y al índice invertido."""
+    for carton in cartones:
+        position = len(game.ids)
+        game.ids.append(carton.id)
+        game.jugadores.append(carton.jugador)
+        game.idiomas.append(carton.idioma)
+        game.palabras.append(carton.palabras)
+        game.indices.append(carton.indices)
+        game.limites.append(carton.limite_palabras)
+        game.marcadas.append(carton.marcadas)
+        game.ya_gano.append(carton.ya_gano)
+        for palabra in carton.palabras:
+            game.indice.setdefault((carton.idioma, palabra), []).append(position)
+
+
+def get_carton(game: GameState, i: int) -> Carton:
+    """Reconstruye (sin validar) el cartón en la posición i de la partida."""
+    return Carton.model_construct(
+        id=game.ids[i],
+        jugador=game.jugadores[i],
+        idioma=game.idiomas[i],
+        palabras=game.palabras[i],
+        marcadas=game.marcadas[i],
+        indices=game.indices[i],
+        limite_palabras=game.limites[i],
+        ya_gano=game.ya_gano[i],
+    )
+
+
+# Palabra entre comillas simples o dobles (respaldo si el archivo no es un
+# literal de Python válido)
+_QUOTED_WORD_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+
+def parse_word_bank(content: str) -> list[str]:
+    """
+    Extrae las palabras de un archivo con formato ['palabra1', 'palabra2', ...]
+
+    El formato es un literal de lista de Python, así que se interpreta con
+    ast.literal_eval en una sola pasada. Esto también respeta las palabras
+    con apóstrofe, que vienen entre comillas dobles (ej: "Moses'").
+    Si el archivo no es un literal válido, se extraen las palabras entre
+    comillas con una expresión regular.
+    """
+    try:
+        words = ast.literal_eval(content)
+    except (ValueError, SyntaxError):
+        return [single or double for single, double in _QUOTED_WORD_RE.findall(content)]
+    return [w for w in words if isinstance(w, str)]
+
+
+def load_word_banks() -> dict[str, frozenset[str]]:
     """
     Carga los bancos de palabras desde archivos .txt
 
     Los archivos tienen formato: ['palabra1', 'palabra2', ...]
+
+    Las palabras se internan (sys.intern) y cada banco se guarda como
+    frozenset inmutable.
     """
-    banks: dict[str, set[str]] = {}
+    banks: dict[str, frozenset[str]] = {}
     languages = ["SP", "EN", "PT", "DT"]
 
     # Buscar archivos en el directorio word_banks
@@ -63,7 +160,7 @@ def load_word_banks() -> dict[str, set[str]]:
     ]
 
     for lang in languages:
-        banks[lang] = set()
+        banks[lang] = frozenset()
 
         for base_path in base_paths:
             file_path = base_path / f"banco_{lang}.txt"
@@ -71,10 +168,9 @@ def load_word_banks() -> dict[str, set[str]]:
                 try:
                     with open(file_path, "r", encoding="utf-8") as f:
                         content = f.read()
-                        # Limpiar formato ['palabra1', 'palabra2', ...]
-                        clean_content = content.replace("[", "").replace("]", "").replace("'", "")
-                        words = [w.strip() for w in clean_content.split(",")]
-                        banks[lang] = set(words)
+                        banks[lang] = frozenset(
+                            map(sys.intern, parse_word_bank(content))
+                        )
                         print(f"Cargado banco {lang}: {len(banks[lang])} palabras")
                         break
                 except Exception as e:
@@ -86,9 +182,12 @@ def load_word_banks() -> dict[str, set[str]]:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager para cargar recursos al iniciar."""
-    global word_banks
+    global word_banks, word_banks_json
     print("Cargando bancos de palabras...")
     word_banks = load_word_banks()
+    word_banks_json = orjson.dumps(
+        {"bancos": {lang: sorted(words) for lang, words in word_banks.items()}}
+    )
     print(f"Bancos cargados: {list(word_banks.keys())}")
     yield
     print("Servidor detenido")
@@ -126,6 +225,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": [
             "/api/process-cards",
+            "/api/restore-game",
             "/api/call-word",
             "/api/check-winners",
             "/api/generate-rounds",
@@ -146,15 +246,17 @@ async def get_word_limits():
 async def get_word_banks():
     """
     Retorna todos los bancos de palabras cargados.
-    
-    Cada banco se retorna como una lista de palabras para facilitar
-    su uso en el frontend.
+
+    Cada banco se retorna como una lista ordenada de palabras para facilitar
+    su uso en el frontend. Los bancos no cambian mientras el servidor está
+    activo, así que el JSON se genera una vez al iniciar y se permite
+    cachearlo en el navegador.
     """
-    return {
-        "bancos": {
-            lang: list(words) for lang, words in word_banks.items()
-        }
-    }
+    return Response(
+        content=word_banks_json,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600, immutable"},
+    )
 
 
 @app.post("/api/process-cards", response_model=ProcessCardsResponse)
@@ -164,13 +266,61 @@ async def process_cards(request: ProcessCardsRequest):
 
     Utiliza:
     - Parsing jerárquico para estructura Jugador -> Cartones
-    - Merge Sort para ordenar palabras de cada cartón
+    - list.sort (Timsort de CPython) para ordenar palabras de cada cartón
     - Validación contra bancos de palabras oficiales
     """
+    game_id = request.game_id
     existing_ids = set(request.existing_ids)
+    if game_id is not None:
+        game = get_game(game_id)
+        existing_ids.update(game.ids)
+
     cartones, errores = process_input_data(request.text, word_banks, existing_ids)
 
-    return ProcessCardsResponse(cartones=cartones, errores=errores)
+    # La partida se crea solo cuando hay cartones válidos que guardar
+    if cartones:
+        if game_id is None:
+            game_id, game = create_game()
+        add_cartones(game, cartones)
+
+    return ProcessCardsResponse(game_id=game_id, cartones=cartones, errores=errores)
+
+
+@app.post("/api/restore-game", response_model=RestoreGameResponse)
+async def restore_game(request: RestoreGameRequest):
+    """
+    Crea una partida a partir de cartones que el cliente ya tiene cargados
+    (con sus marcas), por ejemplo si el servidor se reinició o la partida
+    fue descartada. Las posiciones siguen el orden recibido.
+
+    El índice palabra -> posición de cada cartón se reconstruye desde sus
+    palabras (no se confía en el del cliente), y los cartones completos
+    que aún no ganaron se encolan como ganadores pendientes.
+    """
+    cartones = request.cartones
+    for carton in cartones:
+        limite = len(carton.palabras)
+        if carton.limite_palabras != limite or len(set(carton.palabras)) != limite:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Cartón '{carton.id}': palabras inconsistentes con limite_palabras",
+            )
+        if not 0 <= carton.marcadas < 1 << limite:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Cartón '{carton.id}': marcadas fuera de rango",
+            )
+        carton.indices = {palabra: i for i, palabra in enumerate(carton.palabras)}
+
+    game_id, game = create_game()
+    add_cartones(game, cartones)
+
+    # Cartones completos que el cliente aún no recibió como ganadores
+    for i, limite in enumerate(game.limites):
+        if not game.ya_gano[i] and game.marcadas[i] == (1 << limite) - 1:
+            game.ganadores_pendientes.append(i)
+
+    return RestoreGameResponse(game_id=game_id)
 
 
 @app.post("/api/call-word", response_model=CallWordResponse)
@@ -178,44 +328,44 @@ async def call_word(request: CallWordRequest):
     """
     Procesa el cantado de una palabra.
 
-    Utiliza Binary Search para buscar eficientemente la palabra
-    en cada cartón del idioma actual.
+    Consulta el índice invertido (idioma, palabra) de la partida para
+    obtener solo los cartones que contienen la palabra, y los marca con
+    mark_word_columns (índice palabra -> posición de cada cartón, O(1)).
+    Solo se retornan las posiciones de los cartones modificados.
+
+    Los cartones que completan todas sus palabras (todos los bits de la
+    máscara encendidos) se encolan como ganadores pendientes.
     """
-    # Convertir Pydantic models a dicts para poder modificarlos
-    cartones_dicts = [c.model_dump() for c in request.cartones]
-    found_in_any = False
+    game = get_game(request.game_id)
 
-    for carton in cartones_dicts:
-        # Solo procesar cartones del idioma actual que no hayan ganado
-        if carton["idioma"] == request.idioma_actual and not carton["ya_gano"]:
-            # Usar Binary Search para buscar y marcar
-            if binary_search_mark(carton, request.palabra):
-                found_in_any = True
+    # Cartones que contienen la palabra en el idioma actual
+    hit = game.indice.get((request.idioma_actual, request.palabra), ())
 
-    # Convertir de vuelta a Pydantic models
-    cartones_updated = [Carton(**c) for c in cartones_dicts]
+    updated_indices, completed, found_in_any = mark_word_columns(
+        request.palabra, hit, game.indices, game.marcadas, game.limites, game.ya_gano
+    )
+    game.ganadores_pendientes.extend(completed)
 
-    return CallWordResponse(cartones=cartones_updated, found_in_any=found_in_any)
+    return CallWordResponse(updated_indices=updated_indices, found_in_any=found_in_any)
 
 
 @app.post("/api/check-winners", response_model=CheckWinnersResponse)
 async def check_winners(request: CheckWinnersRequest):
     """
-    Verifica y retorna los cartones ganadores.
+    Retorna los cartones que ganaron desde la última verificación.
 
-    Utiliza algoritmo Greedy con optimización early-break:
-    ordena por distancia a ganar y retorna los completados.
+    En lugar de recorrer todos los cartones (check_winners_greedy),
+    consume la cola de ganadores que call-word llena al completar un cartón:
+    costo proporcional solo a los ganadores nuevos.
+    Los ganadores quedan marcados (ya_gano) en la partida.
     """
-    # Filtrar solo cartones que no hayan ganado previamente
-    cartones_dicts = [
-        c.model_dump() for c in request.cartones if not c.ya_gano
-    ]
-
-    # Usar algoritmo greedy para detectar ganadores
-    winners_dicts = check_winners_greedy(cartones_dicts)
+    game = get_game(request.game_id)
 
-    # Convertir a Pydantic models
-    ganadores = [Carton(**w) for w in winners_dicts]
+    ganadores: list[Carton] = []
+    for i in game.ganadores_pendientes:
+        game.ya_gano[i] = True
+        ganadores.append(get_carton(game, i))
+    game.ganadores_pendientes.clear()
 
     return CheckWinnersResponse(ganadores=ganadores)
 
@@ -235,7 +385,7 @@ async def generate_rounds(request: GenerateRoundsRequest):
 @app.post("/api/validate-word", response_model=ValidateWordResponse)
 async def validate_word(request: ValidateWordRequest):
     """Valida si una palabra existe en el banco del idioma especificado."""
-    bank = word_banks.get(request.idioma, set())
+    bank = word_banks.get(request.idioma, frozenset())
     es_valida = request.palabra in bank
 
     return ValidateWordResponse(es_valida=es_valida)
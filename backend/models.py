@@ -11,11 +11,13 @@ Referencias:
 
 Descripción:
     Este módulo define los modelos de datos (schemas) utilizados para la
-    validación y serialización de datos en la API REST del juego de Bingo.
+    validación y serialización de datos en la API REST del juego de Bingo,
+    y el estado en memoria de cada partida (GameState).
 """
 
+from dataclasses import dataclass, field
 from typing import Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 
 # Tipo de idioma soportado
@@ -31,8 +33,9 @@ class Carton(BaseModel):
         jugador: Nombre/ID del jugador propietario (ej: J1)
         idioma: Código del idioma (SP, EN, PT, DT)
         palabras: Lista de palabras ordenadas alfabéticamente
-        marcadas: Lista de booleanos indicando palabras marcadas
-        total_aciertos: Contador de palabras acertadas
+        marcadas: Máscara de bits; el bit i indica si palabras[i] está marcada
+        indices: Diccionario palabra -> posición en palabras (búsqueda O(1))
+        total_aciertos: Palabras acertadas (bits encendidos de marcadas)
         limite_palabras: Total de palabras en el cartón
         ya_gano: Indica si el cartón ya ganó en una ronda anterior
     """
@@ -41,45 +44,110 @@ class Carton(BaseModel):
     jugador: str
     idioma: Idioma
     palabras: list[str]
-    marcadas: list[bool]
-    total_aciertos: int
+    marcadas: int = 0
+    indices: dict[str, int]
     limite_palabras: int
     ya_gano: bool = False
 
+    @computed_field
+    @property
+    def total_aciertos(self) -> int:
+        """Cantidad de palabras marcadas (popcount de la máscara)."""
+        return self.marcadas.bit_count()
+
+
+@dataclass(slots=True)
+class GameState:
+    """
+    Estado en memoria de una partida, organizado por columnas
+    (Structure of Arrays) en lugar de un objeto por cartón.
+
+    La posición i de cada columna corresponde al i-ésimo cartón cargado
+    (mismo orden que recibe el frontend). Carton se usa solo como schema
+    de la API; la conversión se hace en los bordes (carga y ganadores).
+
+    Attributes:
+        ids, jugadores, idiomas, palabras, indices, limites: Datos fijos
+            de cada cartón (ver Carton)
+        marcadas: Máscara de bits de palabras marcadas por cartón (la
+            cantidad de aciertos es marcadas[i].bit_count())
+        ya_gano: Indica si el cartón ya ganó
+        indice: Índice invertido (idioma, palabra) -> posiciones de cartones
+        ganadores_pendientes: Posiciones de cartones completados aún no
+            reportados por check-winners
+    """
+
+    ids: list[str] = field(default_factory=list)
+    jugadores: list[str] = field(default_factory=list)
+    idiomas: list[Idioma] = field(default_factory=list)
+    palabras: list[list[str]] = field(default_factory=list)
+    indices: list[dict[str, int]] = field(default_factory=list)
+    limites: list[int] = field(default_factory=list)
+    marcadas: list[int] = field(default_factory=list)
+    ya_gano: list[bool] = field(default_factory=list)
+    indice: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+    ganadores_pendientes: list[int] = field(default_factory=list)
+
 
 class ProcessCardsRequest(BaseModel):
-    """Request para procesar texto de entrada con cartones."""
+    """
+    Request para procesar texto de entrada con cartones.
+
+    Si game_id es None se crea una nueva partida (solo si hay cartones
+    válidos); si no, los cartones se agregan a la partida indicada.
+    """
 
     text: str
     existing_ids: list[str] = []
+    game_id: str | None = None
 
 
 class ProcessCardsResponse(BaseModel):
-    """Response con cartones procesados y errores encontrados."""
+    """
+    Response con la partida, cartones procesados y errores encontrados.
 
+    game_id es None si no se indicó partida y no hubo cartones válidos.
+    """
+
+    game_id: str | None
     cartones: list[Carton]
     errores: list[str]
 
 
-class CallWordRequest(BaseModel):
-    """Request para cantar una palabra."""
+class RestoreGameRequest(BaseModel):
+    """Request para recrear una partida con los cartones que tiene el cliente."""
 
     cartones: list[Carton]
+
+
+class RestoreGameResponse(BaseModel):
+    """Response con el identificador de la partida recreada."""
+
+    game_id: str
+
+
+class CallWordRequest(BaseModel):
+    """Request para cantar una palabra en una partida."""
+
+    game_id: str
     palabra: str
     idioma_actual: Idioma
 
 
 class CallWordResponse(BaseModel):
-    """Response con cartones actualizados después de cantar palabra."""
+    """
+    Response con las posiciones (en el orden de carga) de los cartones que
+    marcaron la palabra.
+    """
 
-    cartones: list[Carton]
+    updated_indices: list[int]
     found_in_any: bool
 
 
 class CheckWinnersRequest(BaseModel):
-    """Request para verificar ganadores."""
+    """Request para obtener los ganadores nuevos de una partida."""
 
-    cartones: list[Carton]
+    game_id: str
 
 
 class CheckWinnersResponse(BaseModel):
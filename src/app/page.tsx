@@ -13,7 +13,8 @@ interface Carton {
   jugador: string;
   idioma: Idioma;
   palabras: string[];
-  marcadas: boolean[];
+  marcadas: number;
+  indices: Record<string, number>;
   total_aciertos: number;
   limite_palabras: number;
   ya_gano?: boolean;
@@ -29,6 +30,18 @@ const LIMITES: Record<Idioma, number> = {
 
 const CARTONES_POR_PAGINA = 8;
 
+/**
+ * Error de la API Python con el código HTTP de la respuesta
+ */
+class ApiError extends Error {
+  constructor(
+    message: string,
+    public status: number,
+  ) {
+    super(message);
+  }
+}
+
 /**
  * Helper para hacer requests a la API Python
  */
@@ -51,7 +64,10 @@ async function apiRequest<T>(
   const response = await fetch(`${API_BASE_URL}/api${endpoint}`, options);
 
   if (!response.ok) {
-    throw new Error(`API Error: ${response.status} ${response.statusText}`);
+    throw new ApiError(
+      `API Error: ${response.status} ${response.statusText}`,
+      response.status,
+    );
   }
 
   return response.json();
@@ -59,6 +75,11 @@ async function apiRequest<T>(
 
 export default function BingoPage() {
   const [cartones, setCartones] = useState<Carton[]>([]);
+  // Partida en el servidor (no se renderiza, por eso no es estado)
+  const gameIdRef = useRef<string | null>(null);
+  // Cartones con todas las marcas ya recibidas del servidor, incluso las que
+  // aún no llegaron al estado (se usan para recrear la partida)
+  const cartonesRef = useRef<Carton[]>([]);
   const [palabraActual, setPalabraActual] = useState("");
   const [historialPalabras, setHistorialPalabras] = useState<string[]>([]);
   const [rondas, setRondas] = useState<Idioma[]>([]);
@@ -89,6 +110,10 @@ export default function BingoPage() {
 
   const fileInputRef = useRef<HTMLInputElement>(null);
 
+  useEffect(() => {
+    cartonesRef.current = cartones;
+  }, [cartones]);
+
   // Cargar bancos de palabras desde el backend Python
   useEffect(() => {
     const loadBancos = async () => {
@@ -118,22 +143,58 @@ export default function BingoPage() {
     loadBancos();
   }, []);
 
+  /**
+   * Request a un endpoint de la partida actual. Si el servidor ya no tiene
+   * la partida (404: se reinició o la descartó), la recrea con los cartones
+   * cargados (y sus marcas) y reintenta una vez.
+   */
+  const gameRequest = async <T,>(
+    endpoint: string,
+    body: Record<string, unknown>,
+  ): Promise<T> => {
+    try {
+      return await apiRequest<T>(endpoint, "POST", {
+        ...body,
+        game_id: gameIdRef.current,
+      });
+    } catch (error) {
+      if (!(error instanceof ApiError && error.status === 404)) throw error;
+
+      gameIdRef.current = null;
+      const restored = await apiRequest<{ game_id: string }>(
+        "/restore-game",
+        "POST",
+        { cartones: cartonesRef.current },
+      );
+      gameIdRef.current = restored.game_id;
+
+      return apiRequest<T>(endpoint, "POST", {
+        ...body,
+        game_id: gameIdRef.current,
+      });
+    }
+  };
+
   /**
    * Procesa cartones usando la API Python
-   * Utiliza Merge Sort (implementado en Python) para ordenar las palabras
+   * El servidor ordena las palabras de cada cartón (list.sort de Python)
    */
   const processCardsViaAPI = async (
     text: string,
     existingIds: string[],
   ): Promise<{ cartones: Carton[]; errores: string[] }> => {
     try {
-      const response = await apiRequest<{
+      const response = await gameRequest<{
+        game_id: string | null;
         cartones: Carton[];
         errores: string[];
-      }>("/process-cards", "POST", {
+      }>("/process-cards", {
         text,
         existing_ids: existingIds,
       });
+      if (response.game_id) {
+        gameIdRef.current = response.game_id;
+      }
       setApiError(null);
       return response;
     } catch (error) {
@@ -277,8 +338,8 @@ export default function BingoPage() {
 
   /**
    * Canta una palabra usando la API Python
-   * Utiliza Binary Search (implementado en Python) para buscar en cartones
-   * Utiliza Greedy Algorithm (implementado en Python) para detectar ganadores
+   * El servidor marca la palabra con un índice invertido y encola los
+   * cartones que se completan como ganadores pendientes
    */
   const handleCantarPalabra = async () => {
     if (!idiomaActual || rondaBloqueada) return;
@@ -301,30 +362,32 @@ export default function BingoPage() {
     }
 
     try {
-      // 1. Llamar a la API para marcar la palabra (usa Binary Search)
-      const callResponse = await apiRequest<{
-        cartones: Carton[];
+      // 1. Llamar a la API para marcar la palabra (el estado vive en el servidor)
+      const callResponse = await gameRequest<{
+        updated_indices: number[];
         found_in_any: boolean;
-      }>("/call-word", "POST", {
-        cartones,
+      }>("/call-word", {
         palabra: palabraNormalizada,
         idioma_actual: idiomaActual,
       });
 
-      // 2. Verificar ganadores (usa Greedy Algorithm)
-      const winnersResponse = await apiRequest<{ ganadores: Carton[] }>(
+      // 2. Aplicar las marcas a los cartones que cambiaron (antes de pedir
+      // ganadores, por si hay que recrear la partida con ellas)
+      const updatedIndices = new Set(callResponse.updated_indices);
+      let updatedCartones = cartonesRef.current.map((c, i) => {
+        if (!updatedIndices.has(i)) return c;
+        const marcadas = c.marcadas | (1 << c.indices[palabraNormalizada]);
+        return { ...c, marcadas, total_aciertos: c.total_aciertos + 1 };
+      });
+      cartonesRef.current = updatedCartones;
+      setCartones(updatedCartones);
+
+      // 3. Obtener los ganadores pendientes
+      const winnersResponse = await gameRequest<{ ganadores: Carton[] }>(
         "/check-winners",
-        "POST",
-        {
-          cartones: callResponse.cartones.filter(
-            (c) => c.idioma === idiomaActual && !c.ya_gano,
-          ),
-        },
+        {},
       );
 
-      // 3. Actualizar estado con cartones marcados
-      let updatedCartones = callResponse.cartones;
-
       if (winnersResponse.ganadores.length > 0) {
         // Marcar ganadores
         const winnerIds = new Set(winnersResponse.ganadores.map((g) => g.id));
@@ -411,8 +474,8 @@ export default function BingoPage() {
         <h1>Bingo_P</h1>
         <p>Sistema de Gestión de Bingo de Palabras Masivo</p>
         <p style={{ fontSize: "0.75rem", color: "var(--text-secondary)" }}>
-          Backend: Python FastAPI | Algoritmos: Merge Sort, Binary Search,
-          Greedy
+          Backend: Python FastAPI | Estructuras: índice invertido, máscaras
+          de bits, cola de ganadores
         </p>
 
         {apiError && (
@@ -800,7 +863,7 @@ export default function BingoPage() {
                       <span
                         key={crypto.randomUUID()}
                         className={`${styles.wordItem} ${
-                          carton.marcadas[idx]
+                          (carton.marcadas >> idx) & 1
                             ? styles.wordMarked
                             : styles.wordPending
                         }`}